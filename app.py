@@ -1,13 +1,18 @@
-from flask import Flask, render_template, request, redirect, url_for, flash, session, jsonify, send_file
+from flask import Flask, render_template, request, redirect, url_for, flash, session, jsonify, send_file, Response, stream_with_context
 from flask_sqlalchemy import SQLAlchemy
 from werkzeug.security import generate_password_hash, check_password_hash
-from datetime import datetime
+from datetime import datetime, timedelta, time
+from collections import namedtuple
+import calendar
+import hashlib
 import os
 
 app = Flask(__name__)
 app.config['SECRET_KEY'] = 'your-secret-key-here'
 app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///users.db'
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+# Allow deployments to override settings, e.g. FLASK_SECRET_KEY or FLASK_SQLALCHEMY_DATABASE_URI
+app.config.from_prefixed_env()
 
 db = SQLAlchemy(app)
 
@@ -34,8 +39,12 @@ class Event(db.Model):
     current_participants = db.Column(db.Integer, default=0)
     status = db.Column(db.String(20), default='upcoming')  # 'upcoming', 'ongoing', 'completed', 'cancelled'
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
 
+    # Calendar views and feeds query one user's events by date window
+    __table_args__ = (db.Index('ix_event_user_date', 'user_id', 'date'),)
+
     def to_dict(self):
         return {
             'id': self.id,
@@ -105,6 +114,81 @@ class CourseResource(db.Model):
     def __repr__(self):
         return f'<CourseResource {self.title}>'
 
+# Read-only records for API read paths: column tuples are selected straight
+# into namedtuples, skipping ORM instances, identity-map and change tracking.
+EventRecord = namedtuple('EventRecord', [
+    'id', 'title', 'description', 'event_type', 'date', 'location', 'max_participants',
+    'current_participants', 'status', 'created_at', 'user_id', 'creator_username'
+])
+CourseRecord = namedtuple('CourseRecord', [
+    'id', 'course_code', 'course_name', 'description', 'department', 'created_at'
+])
+ResourceRecord = namedtuple('ResourceRecord', [
+    'id', 'title', 'description', 'resource_type', 'file_size', 'external_link',
+    'uploaded_at', 'course_id', 'course_code', 'course_name'
+])
+
+def select_event_records(*criteria, order_by=None):
+    """Return EventRecords matching the criteria, with the creator's username joined in."""
+    query = db.select(
+        Event.id, Event.title, Event.description, Event.event_type, Event.date, Event.location,
+        Event.max_participants, Event.current_participants, Event.status, Event.created_at,
+        Event.user_id, User.username
+    ).outerjoin(User, Event.user_id == User.id).where(*criteria)
+    if order_by is not None:
+        query = query.order_by(order_by)
+    return [EventRecord._make(row) for row in db.session.execute(query)]
+
+def select_course_records(*criteria, order_by=None):
+    """Return CourseRecords matching the criteria."""
+    query = db.select(
+        Course.id, Course.course_code, Course.course_name, Course.description,
+        Course.department, Course.created_at
+    ).where(*criteria)
+    if order_by is not None:
+        query = query.order_by(order_by)
+    return [CourseRecord._make(row) for row in db.session.execute(query)]
+
+def select_resource_records(*criteria, order_by=None):
+    """Return ResourceRecords matching the criteria, with the course code and name joined in."""
+    query = db.select(
+        CourseResource.id, CourseResource.title, CourseResource.description,
+        CourseResource.resource_type, CourseResource.file_size, CourseResource.external_link,
+        CourseResource.uploaded_at, CourseResource.course_id, Course.course_code, Course.course_name
+    ).join(Course, CourseResource.course_id == Course.id).where(*criteria)
+    if order_by is not None:
+        query = query.order_by(order_by)
+    return [ResourceRecord._make(row) for row in db.session.execute(query)]
+
+def count_resources_by_course(course_ids=None):
+    """Return {course_id: resource count} in one grouped query, for the given courses or all of them."""
+    query = db.select(CourseResource.course_id, db.func.count(CourseResource.id)).group_by(CourseResource.course_id)
+    if course_ids is not None:
+        query = query.where(CourseResource.course_id.in_(course_ids))
+    return dict(db.session.execute(query).all())
+
+# Hot listing queries, shared by the API routes and warm_caches() so warm-up
+# always compiles exactly the statements requests run
+def course_listing(search_query=''):
+    """Return (CourseRecords, {course_id: resource count}) for the course listing API."""
+    if search_query:
+        # Search in course code, course name, and department
+        courses = select_course_records(
+            db.or_(
+                Course.course_code.ilike(f'%{search_query}%'),
+                Course.course_name.ilike(f'%{search_query}%'),
+                Course.department.ilike(f'%{search_query}%')
+            ),
+            order_by=Course.course_code
+        )
+        # Only count resources of the matching courses
+        return courses, count_resources_by_course([course.id for course in courses])
+    return select_course_records(order_by=Course.course_code), count_resources_by_course()
+
+def event_listing():
+    """Return EventRecords of all events for the event listing API, newest date first."""
+    return select_event_records(order_by=Event.date.desc())
+
 # Helper function to check if user is logged in
 def login_required(f):
     def decorated_function(*args, **kwargs):
@@ -116,13 +200,186 @@ def login_required(f):
     decorated_function.__name__ = f.__name__
     return decorated_function
 
+# Helper functions to serialize read-only records for the public API
+def course_api_dict(course):
+    return {
+        'course_id': course.id,
+        'course_code': course.course_code,
+        'course_name': course.course_name,
+        'description': course.description,
+        'department': course.department,
+        'created_at': course.created_at.isoformat() if course.created_at else None
+    }
+
+def resource_api_dict(resource):
+    return {
+        'resource_id': resource.id,
+        'title': resource.title,
+        'description': resource.description,
+        'resource_type': resource.resource_type,
+        'file_size': resource.file_size,
+        'external_link': resource.external_link,
+        'uploaded_at': resource.uploaded_at.isoformat() if resource.uploaded_at else None
+    }
+
+def resource_with_course_api_dict(resource):
+    resource_data = resource_api_dict(resource)
+    resource_data['course_id'] = resource.course_id
+    resource_data['course_code'] = resource.course_code
+    resource_data['course_name'] = resource.course_name
+    return resource_data
+
+def event_api_dict(event):
+    return {
+        'event_id': event.id,
+        'event_title': event.title,
+        'event_description': event.description,
+        'event_type': event.event_type,
+        'event_date': event.date.isoformat() if event.date else None,
+        'event_location': event.location,
+        'max_participants': event.max_participants,
+        'current_participants': event.current_participants,
+        'event_status': event.status,
+        'created_at': event.created_at.isoformat() if event.created_at else None,
+        'created_by': event.creator_username,
+        'creator_id': event.user_id
+    }
+
+# Batch lookup helpers
+BATCH_MAX_IDS = 100
+BATCH_MAX_PAYLOAD_BYTES = 1024 * 1024
+
+def parse_id_list(raw):
+    """Parse an ids query value such as '1,2,3' into unique ints, keeping request order."""
+    try:
+        ids = list(dict.fromkeys(int(part) for part in raw.split(',') if part.strip()))
+    except ValueError:
+        raise ValueError('ids must be a comma-separated list of integers')
+    if not ids:
+        raise ValueError('No ids provided')
+    if len(ids) > BATCH_MAX_IDS:
+        raise ValueError(f'Too many ids: at most {BATCH_MAX_IDS} per request')
+    return ids
+
+def batch_response(ids, items_by_id, serialize, label):
+    """
+    Build a multi-get response in request order. Unknown ids are reported in
+    'errors'; once the serialized results reach BATCH_MAX_PAYLOAD_BYTES the
+    remaining ids are listed in 'truncated' for the client to request again.
+    The first found item is always returned, however large, so re-requesting
+    truncated ids always makes progress. Each item is serialized exactly once
+    and the body is assembled from those pieces.
+    """
+    results, errors, truncated = [], [], []
+    payload_size = 0
+    for item_id in ids:
+        item = items_by_id.get(item_id)
+        if item is None:
+            errors.append({'id': item_id, 'error': f'{label} with ID {item_id} not found'})
+            continue
+        if truncated:
+            truncated.append(item_id)
+            continue
+        item_json = app.json.dumps(serialize(item))
+        if results and payload_size + len(item_json) > BATCH_MAX_PAYLOAD_BYTES:
+            truncated.append(item_id)
+            continue
+        payload_size += len(item_json)
+        results.append(item_json)
+    body = '{"errors": %s, "results": [%s], "truncated": %s}' % (
+        app.json.dumps(errors), ', '.join(results), app.json.dumps(truncated)
+    )
+    return app.response_class(body, mimetype='application/json')
+
+# Calendar helpers
+CALENDAR_MAX_RANGE_DAYS = 366
+EVENTS_PER_PAGE = 24
+
+def calendar_window(view, anchor):
+    """Return (start, end, weeks) of the month or week grid containing the anchor date."""
+    if view == 'week':
+        first_day = anchor - timedelta(days=anchor.weekday())
+        weeks = [[first_day + timedelta(days=i) for i in range(7)]]
+    else:
+        weeks = calendar.Calendar().monthdatescalendar(anchor.year, anchor.month)
+    start = datetime.combine(weeks[0][0], time.min)
+    end = datetime.combine(weeks[-1][-1] + timedelta(days=1), time.min)
+    return start, end, weeks
+
+def parse_range_bound(value):
+    """
+    Parse an ISO date or datetime. Event.date holds the wall-clock time as
+    entered and the write paths drop any offset, so the offset is dropped here too.
+    """
+    return datetime.fromisoformat(value.replace('Z', '+00:00')).replace(tzinfo=None)
+
+def events_in_range(user_id, start, end):
+    """Return EventRecords of a user with start <= date < end, served by ix_event_user_date."""
+    return select_event_records(
+        Event.user_id == user_id,
+        Event.date >= start,
+        Event.date < end,
+        order_by=Event.date
+    )
+
+def events_etag(user_id):
+    """Fingerprint a user's events with one aggregate query; changes on any add, edit or delete."""
+    count, max_id, last_change = db.session.query(
+        db.func.count(Event.id),
+        db.func.max(Event.id),
+        db.func.max(db.func.coalesce(Event.updated_at, Event.created_at))
+    ).filter(Event.user_id == user_id).one()
+    return hashlib.sha1(f'{user_id}:{count}:{max_id}:{last_change}'.encode()).hexdigest()
+
+def ics_escape(text):
+    return (text or '').replace('\\', '\\\\').replace(';', '\\;').replace(',', '\\,').replace('\r\n', '\\n').replace('\n', '\\n')
+
+def ics_line(name, value):
+    """Format one iCalendar content line, folded at 75 octets (RFC 5545)."""
+    line = f'{name}:{value}'.encode('utf-8')
+    chunks = []
+    while len(line) > 75:
+        cut = 75 if not chunks else 74
+        # Never split a multi-byte UTF-8 character
+        while line[cut] & 0xC0 == 0x80:
+            cut -= 1
+        chunks.append(line[:cut])
+        line = line[cut:]
+    chunks.append(line)
+    return b'\r\n '.join(chunks).decode('utf-8') + '\r\n'
+
+def generate_ics(user_id, host):
+    """Yield a user's events as an iCalendar document, one VEVENT at a time."""
+    yield 'BEGIN:VCALENDAR\r\nVERSION:2.0\r\nPRODID:-//Api-testing-by-flask//Events//EN\r\nCALSCALE:GREGORIAN\r\n'
+    rows = db.session.execute(
+        db.select(
+            Event.id, Event.title, Event.description, Event.date, Event.location,
+            Event.status, Event.created_at, Event.updated_at
+        ).where(Event.user_id == user_id).order_by(Event.date).execution_options(yield_per=200)
+    )
+    for row in rows:
+        stamp = row.updated_at or row.created_at or datetime.utcnow()
+        yield (
+            'BEGIN:VEVENT\r\n'
+            + ics_line('UID', f'event-{row.id}@{host}')
+            + ics_line('DTSTAMP', stamp.strftime('%Y%m%dT%H%M%SZ'))
+            + ics_line('DTSTART', row.date.strftime('%Y%m%dT%H%M%S'))
+            + ics_line('SUMMARY', ics_escape(row.title))
+            + ics_line('DESCRIPTION', ics_escape(row.description))
+            + ics_line('LOCATION', ics_escape(row.location))
+            + ics_line('STATUS', 'CANCELLED' if row.status == 'cancelled' else 'CONFIRMED')
+            + 'END:VEVENT\r\n'
+        )
+    yield 'END:VCALENDAR\r\n'
+
 # Routes
 @app.route('/21201327')
 def home():
     if 'user_id' in session:
         user = User.query.get(session['user_id'])
-        events = Event.query.filter_by(user_id=user.id).order_by(Event.date.desc()).all()
-        return render_template('home.html', user=user, events=events)
+        events = Event.query.filter_by(user_id=user.id).order_by(Event.date.desc()).limit(3).all()
+        event_count = Event.query.filter_by(user_id=user.id).count()
+        return render_template('home.html', user=user, events=events, event_count=event_count)
     return redirect(url_for('login'))
 
 @app.route('/register/21201327', methods=['GET', 'POST'])
@@ -183,8 +440,11 @@ def logout():
 @login_required
 def events():
     user = User.query.get(session['user_id'])
-    events = Event.query.filter_by(user_id=user.id).order_by(Event.date.desc()).all()
-    return render_template('events.html', user=user, events=events)
+    page = request.args.get('page', 1, type=int)
+    pagination = Event.query.filter_by(user_id=user.id).order_by(Event.date.desc()).paginate(
+        page=page, per_page=EVENTS_PER_PAGE, error_out=False
+    )
+    return render_template('events.html', user=user, events=pagination.items, pagination=pagination)
 
 @app.route('/events/create/21201327', methods=['GET', 'POST'])
 @login_required
@@ -266,6 +526,35 @@ def delete_event(event_id):
     flash('Event deleted successfully!')
     return redirect(url_for('events'))
 
+@app.route('/events/calendar/21201327')
+@login_required
+def event_calendar():
+    view = request.args.get('view', 'month')
+    if view not in ('month', 'week'):
+        view = 'month'
+    
+    try:
+        anchor = datetime.strptime(request.args['date'], '%Y-%m-%d').date() if 'date' in request.args else datetime.now().date()
+    except ValueError:
+        flash('Invalid date format!')
+        return redirect(url_for('event_calendar'))
+    
+    start, end, weeks = calendar_window(view, anchor)
+    events_by_day = {}
+    for event in events_in_range(session['user_id'], start, end):
+        events_by_day.setdefault(event.date.date(), []).append(event)
+    
+    if view == 'week':
+        prev_date = anchor - timedelta(days=7)
+        next_date = anchor + timedelta(days=7)
+    else:
+        prev_date = anchor.replace(day=1) - timedelta(days=1)
+        next_date = (anchor.replace(day=28) + timedelta(days=4)).replace(day=1)
+    
+    return render_template('calendar.html', view=view, anchor=anchor, weeks=weeks,
+                           events_by_day=events_by_day, prev_date=prev_date, next_date=next_date,
+                           today=datetime.now().date())
+
 # Course Repository Routes
 @app.route('/courses/21201327')
 @login_required
@@ -386,29 +675,12 @@ def api_get_courses():
     try:
         search_query = request.args.get('search', '')
         
-        if search_query:
-            # Search in course code, course name, and department
-            courses = Course.query.filter(
-                db.or_(
-                    Course.course_code.ilike(f'%{search_query}%'),
-                    Course.course_name.ilike(f'%{search_query}%'),
-                    Course.department.ilike(f'%{search_query}%')
-                )
-            ).order_by(Course.course_code).all()
-        else:
-            courses = Course.query.order_by(Course.course_code).all()
+        courses, resource_counts = course_listing(search_query)
         
         courses_data = []
         for course in courses:
-            course_data = {
-                'course_id': course.id,
-                'course_code': course.course_code,
-                'course_name': course.course_name,
-                'description': course.description,
-                'department': course.department,
-                'resource_count': len(course.resources),
-                'created_at': course.created_at.isoformat() if course.created_at else None
-            }
+            course_data = course_api_dict(course)
+            course_data['resource_count'] = resource_counts.get(course.id, 0)
             courses_data.append(course_data)
         
         return jsonify(courses_data)
@@ -419,54 +691,58 @@ def api_get_courses():
 def api_get_course(course_id):
 
     try:
-        course = Course.query.get_or_404(course_id)
-        resources = CourseResource.query.filter_by(course_id=course_id).order_by(CourseResource.uploaded_at.desc()).all()
-        
-        course_data = {
-            'course_id': course.id,
-            'course_code': course.course_code,
-            'course_name': course.course_name,
-            'description': course.description,
-            'department': course.department,
-            'created_at': course.created_at.isoformat() if course.created_at else None,
-            'resources': []
-        }
+        courses = select_course_records(Course.id == course_id)
+        if not courses:
+            return jsonify({'error': f'Course with ID {course_id} not found'}), 404
+        resources = select_resource_records(CourseResource.course_id == course_id, order_by=CourseResource.uploaded_at.desc())
         
-        for resource in resources:
-            resource_data = {
-                'resource_id': resource.id,
-                'title': resource.title,
-                'description': resource.description,
-                'resource_type': resource.resource_type,
-                'file_size': resource.file_size,
-                'external_link': resource.external_link,
-                'uploaded_at': resource.uploaded_at.isoformat() if resource.uploaded_at else None
-            }
-            course_data['resources'].append(resource_data)
+        course_data = course_api_dict(courses[0])
+        course_data['resources'] = [resource_api_dict(resource) for resource in resources]
         
         return jsonify(course_data)
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/courses/batch/21201327', methods=['GET'])
+def api_get_courses_batch():
+    """
+    PUBLIC API ENDPOINT: Get several courses with their resources
+    Method: GET
+    Authentication: Not required (Public API)
+    Parameters: ids (comma-separated course ids, e.g. ?ids=1,2,3)
+    Returns: JSON object with 'results', per-id 'errors' and size-capped 'truncated' ids
+    """
+    try:
+        ids = parse_id_list(request.args.get('ids', ''))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    try:
+        courses = select_course_records(Course.id.in_(ids))
+        resources = select_resource_records(CourseResource.course_id.in_(ids), order_by=CourseResource.uploaded_at.desc())
+        
+        resources_by_course = {}
+        for resource in resources:
+            resources_by_course.setdefault(resource.course_id, []).append(resource_api_dict(resource))
+        
+        def serialize(course):
+            course_data = course_api_dict(course)
+            course_data['resources'] = resources_by_course.get(course.id, [])
+            return course_data
+        
+        return batch_response(ids, {course.id: course for course in courses}, serialize, 'Course')
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
 @app.route('/api/courses/<int:course_id>/resources/21201327', methods=['GET'])
 def api_get_course_resources(course_id):
 
     try:
-        course = Course.query.get_or_404(course_id)
-        resources = CourseResource.query.filter_by(course_id=course_id).order_by(CourseResource.uploaded_at.desc()).all()
+        if not select_course_records(Course.id == course_id):
+            return jsonify({'error': f'Course with ID {course_id} not found'}), 404
+        resources = select_resource_records(CourseResource.course_id == course_id, order_by=CourseResource.uploaded_at.desc())
         
-        resources_data = []
-        for resource in resources:
-            resource_data = {
-                'resource_id': resource.id,
-                'title': resource.title,
-                'description': resource.description,
-                'resource_type': resource.resource_type,
-                'file_size': resource.file_size,
-                'external_link': resource.external_link,
-                'uploaded_at': resource.uploaded_at.isoformat() if resource.uploaded_at else None
-            }
-            resources_data.append(resource_data)
+        resources_data = [resource_api_dict(resource) for resource in resources]
         
         return jsonify(resources_data)
     except Exception as e:
@@ -481,22 +757,32 @@ def api_get_resource(resource_id):
     Returns: JSON object of resource details
     """
     try:
-        resource = CourseResource.query.get_or_404(resource_id)
-        
-        resource_data = {
-            'resource_id': resource.id,
-            'title': resource.title,
-            'description': resource.description,
-            'resource_type': resource.resource_type,
-            'file_size': resource.file_size,
-            'external_link': resource.external_link,
-            'uploaded_at': resource.uploaded_at.isoformat() if resource.uploaded_at else None,
-            'course_id': resource.course_id,
-            'course_code': resource.course.course_code,
-            'course_name': resource.course.course_name
-        }
+        resources = select_resource_records(CourseResource.id == resource_id)
+        if not resources:
+            return jsonify({'error': f'Resource with ID {resource_id} not found'}), 404
+        
+        return jsonify(resource_with_course_api_dict(resources[0]))
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/courses/resources/batch/21201327', methods=['GET'])
+def api_get_resources_batch():
+    """
+    PUBLIC API ENDPOINT: Get several resources with their course
+    Method: GET
+    Authentication: Not required (Public API)
+    Parameters: ids (comma-separated resource ids, e.g. ?ids=1,2,3)
+    Returns: JSON object with 'results', per-id 'errors' and size-capped 'truncated' ids
+    """
+    try:
+        ids = parse_id_list(request.args.get('ids', ''))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    try:
+        resources = select_resource_records(CourseResource.id.in_(ids))
         
-        return jsonify(resource_data)
+        return batch_response(ids, {resource.id: resource for resource in resources}, resource_with_course_api_dict, 'Resource')
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -506,25 +792,11 @@ def api_get_events():
 
     try:
        
-        events = Event.query.order_by(Event.date.desc()).all()
+        events = event_listing()
         events_data = []
         
         for event in events:
-            event_data = {
-                'event_id': event.id,
-                'event_title': event.title,
-                'event_description': event.description,
-                'event_type': event.event_type,
-                'event_date': event.date.isoformat() if event.date else None,
-                'event_location': event.location,
-                'max_participants': event.max_participants,
-                'current_participants': event.current_participants,
-                'event_status': event.status,
-                'created_at': event.created_at.isoformat() if event.created_at else None,
-                'created_by': event.creator.username if event.creator else None,
-                'creator_id': event.user_id
-            }
-            events_data.append(event_data)
+            events_data.append(event_api_dict(event))
         
         return jsonify(events_data)
     except Exception as e:
@@ -584,8 +856,8 @@ def api_get_event(event_id):
     Returns: JSON object of the event with explicit formatting
     """
     try:
-        event = Event.query.get(event_id)
-        if not event:
+        events = select_event_records(Event.id == event_id)
+        if not events:
             return jsonify({
                 'status': 'error',
                 'message': f'Event with ID {event_id} not found',
@@ -593,20 +865,7 @@ def api_get_event(event_id):
                 'method': 'GET'
             }), 404
         
-        event_data = {
-            'event_id': event.id,
-            'event_title': event.title,
-            'event_description': event.description,
-            'event_type': event.event_type,
-            'event_date': event.date.isoformat() if event.date else None,
-            'event_location': event.location,
-            'max_participants': event.max_participants,
-            'current_participants': event.current_participants,
-            'event_status': event.status,
-            'created_at': event.created_at.isoformat() if event.created_at else None,
-            'created_by': event.creator.username if event.creator else None,
-            'creator_id': event.user_id
-        }
+        event_data = event_api_dict(events[0])
         
         return jsonify({
             'status': 'success',
@@ -624,6 +883,27 @@ def api_get_event(event_id):
             'method': 'GET'
         }), 500
 
+@app.route('/api/events/batch/21201327', methods=['GET'])
+def api_get_events_batch():
+    """
+    PUBLIC API ENDPOINT: Get several events by ID
+    Method: GET
+    Authentication: Not required (Public API)
+    Parameters: ids (comma-separated event ids, e.g. ?ids=1,2,3)
+    Returns: JSON object with 'results', per-id 'errors' and size-capped 'truncated' ids
+    """
+    try:
+        ids = parse_id_list(request.args.get('ids', ''))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    try:
+        events = select_event_records(Event.id.in_(ids))
+        
+        return batch_response(ids, {event.id: event for event in events}, event_api_dict, 'Event')
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
 @app.route('/api/events/<int:event_id>/21201327', methods=['PUT'])
 def api_update_event(event_id):
     event = Event.query.get_or_404(event_id)
@@ -661,86 +941,198 @@ def api_delete_event(event_id):
     db.session.commit()
     return jsonify({'message': 'Event deleted successfully'})
 
-if __name__ == '__main__':
-    with app.app_context():
-        db.create_all()
-        
-        # Create sample courses if none exist
-        if not Course.query.first():
-            sample_courses = [
-                Course(
-                    course_code='CSE110',
-                    course_name='Programming Language I',
-                    description='Introduction to programming concepts using Python. Covers basic syntax, data types, control structures, functions, and object-oriented programming fundamentals.',
-                    department='Computer Science and Engineering'
-                ),
-                Course(
-                    course_code='CSE111',
-                    course_name='Programming Language II',
-                    description='Advanced programming concepts including data structures, algorithms, and software development practices.',
-                    department='Computer Science and Engineering'
+@app.route('/api/users/<int:user_id>/events/21201327', methods=['GET'])
+def api_get_user_events(user_id):
+    """
+    PUBLIC API ENDPOINT: Get a user's events within a date range
+    Method: GET
+    Authentication: Not required (Public API)
+    Parameters: start, end (ISO dates or datetimes, end exclusive; offsets are ignored like on create/update; defaults to the current month)
+    Returns: JSON object with the range and its events ordered by date
+    """
+    user = User.query.get(user_id)
+    if not user:
+        return jsonify({'error': f'User with ID {user_id} not found'}), 404
+    
+    try:
+        if 'start' in request.args:
+            start = parse_range_bound(request.args['start'])
+        else:
+            start = datetime.combine(datetime.now().date().replace(day=1), time.min)
+        if 'end' in request.args:
+            end = parse_range_bound(request.args['end'])
+        else:
+            end = datetime.combine((start.replace(day=28) + timedelta(days=4)).replace(day=1), time.min)
+    except ValueError:
+        return jsonify({'error': 'Invalid date format. Use ISO format (YYYY-MM-DD or YYYY-MM-DDTHH:MM:SS)'}), 400
+    
+    if end <= start:
+        return jsonify({'error': 'end must be after start'}), 400
+    if end - start > timedelta(days=CALENDAR_MAX_RANGE_DAYS):
+        return jsonify({'error': f'Date range cannot exceed {CALENDAR_MAX_RANGE_DAYS} days'}), 400
+    
+    events = events_in_range(user_id, start, end)
+    return jsonify({
+        'user_id': user_id,
+        'start': start.isoformat(),
+        'end': end.isoformat(),
+        'count': len(events),
+        'events': [event_api_dict(event) for event in events]
+    })
+
+@app.route('/api/users/<int:user_id>/events/ics/21201327', methods=['GET'])
+def api_get_user_events_ics(user_id):
+    """
+    PUBLIC API ENDPOINT: iCalendar feed of a user's events
+    Method: GET
+    Authentication: Not required (Public API)
+    Returns: Streamed text/calendar document; 304 when If-None-Match matches the ETag
+    """
+    user = User.query.get(user_id)
+    if not user:
+        return jsonify({'error': f'User with ID {user_id} not found'}), 404
+    
+    etag = events_etag(user_id)
+    if request.if_none_match.contains(etag):
+        response = Response(status=304)
+    else:
+        response = Response(stream_with_context(generate_ics(user_id, request.host)), mimetype='text/calendar')
+        response.headers['Content-Disposition'] = f'inline; filename="user-{user_id}-events.ics"'
+    response.set_etag(etag)
+    return response
+
+# Database setup (one-shot, kept out of the serving path)
+def seed_sample_data():
+    """Create sample courses and resources if the course table is empty."""
+    if not Course.query.first():
+        sample_courses = [
+            Course(
+                course_code='CSE110',
+                course_name='Programming Language I',
+                description='Introduction to programming concepts using Python. Covers basic syntax, data types, control structures, functions, and object-oriented programming fundamentals.',
+                department='Computer Science and Engineering'
+            ),
+            Course(
+                course_code='CSE111',
+                course_name='Programming Language II',
+                description='Advanced programming concepts including data structures, algorithms, and software development practices.',
+                department='Computer Science and Engineering'
+            ),
+            Course(
+                course_code='CSE220',
+                course_name='Data Structures',
+                description='Study of fundamental data structures including arrays, linked lists, stacks, queues, trees, and graphs.',
+                department='Computer Science and Engineering'
+            ),
+            Course(
+                course_code='CSE221',
+                course_name='Algorithms',
+                description='Analysis and design of algorithms, complexity analysis, and algorithm optimization techniques.',
+                department='Computer Science and Engineering'
+            ),
+            Course(
+                course_code='CSE310',
+                course_name='Database Management Systems',
+                description='Introduction to database concepts, SQL, database design, and database management systems.',
+                department='Computer Science and Engineering'
+            )
+        ]
+        
+        for course in sample_courses:
+            db.session.add(course)
+        
+        db.session.commit()
+        
+        # Add sample resources for CSE110
+        cse110 = Course.query.filter_by(course_code='CSE110').first()
+        if cse110:
+            sample_resources = [
+                CourseResource(
+                    title='Week 1 Lecture Notes',
+                    description='Introduction to Python programming basics, variables, and data types.',
+                    resource_type='document',
+                    course_id=cse110.id
                 ),
-                Course(
-                    course_code='CSE220',
-                    course_name='Data Structures',
-                    description='Study of fundamental data structures including arrays, linked lists, stacks, queues, trees, and graphs.',
-                    department='Computer Science and Engineering'
+                CourseResource(
+                    title='Python Installation Guide',
+                    description='Step-by-step guide for installing Python and setting up the development environment.',
+                    resource_type='link',
+                    external_link='https://www.python.org/downloads/',
+                    course_id=cse110.id
                 ),
-                Course(
-                    course_code='CSE221',
-                    course_name='Algorithms',
-                    description='Analysis and design of algorithms, complexity analysis, and algorithm optimization techniques.',
-                    department='Computer Science and Engineering'
+                CourseResource(
+                    title='Assignment 1: Hello World',
+                    description='First programming assignment to create a simple Hello World program.',
+                    resource_type='assignment',
+                    course_id=cse110.id
                 ),
-                Course(
-                    course_code='CSE310',
-                    course_name='Database Management Systems',
-                    description='Introduction to database concepts, SQL, database design, and database management systems.',
-                    department='Computer Science and Engineering'
+                CourseResource(
+                    title='Course Syllabus',
+                    description='Complete course syllabus with topics, schedule, and grading policy.',
+                    resource_type='syllabus',
+                    course_id=cse110.id
                 )
             ]
             
-            for course in sample_courses:
-                db.session.add(course)
+            for resource in sample_resources:
+                db.session.add(resource)
             
             db.session.commit()
-            
-            # Add sample resources for CSE110
-            cse110 = Course.query.filter_by(course_code='CSE110').first()
-            if cse110:
-                sample_resources = [
-                    CourseResource(
-                        title='Week 1 Lecture Notes',
-                        description='Introduction to Python programming basics, variables, and data types.',
-                        resource_type='document',
-                        course_id=cse110.id
-                    ),
-                    CourseResource(
-                        title='Python Installation Guide',
-                        description='Step-by-step guide for installing Python and setting up the development environment.',
-                        resource_type='link',
-                        external_link='https://www.python.org/downloads/',
-                        course_id=cse110.id
-                    ),
-                    CourseResource(
-                        title='Assignment 1: Hello World',
-                        description='First programming assignment to create a simple Hello World program.',
-                        resource_type='assignment',
-                        course_id=cse110.id
-                    ),
-                    CourseResource(
-                        title='Course Syllabus',
-                        description='Complete course syllabus with topics, schedule, and grading policy.',
-                        resource_type='syllabus',
-                        course_id=cse110.id
-                    )
-                ]
-                
-                for resource in sample_resources:
-                    db.session.add(resource)
-                
-                db.session.commit()
-            
-            print("Sample courses and resources created successfully!")
+        
+        print("Sample courses and resources created successfully!")
+
+
+def upgrade_schema():
+    """Add columns and indexes introduced after a database was first created."""
+    event_columns = [column['name'] for column in db.inspect(db.engine).get_columns('event')]
+    if 'updated_at' not in event_columns:
+        with db.engine.begin() as connection:
+            connection.execute(db.text('ALTER TABLE event ADD COLUMN updated_at DATETIME'))
+    for index in Event.__table__.indexes:
+        index.create(db.engine, checkfirst=True)
+
+def init_db():
+    """Create all tables, upgrade existing ones and seed sample data."""
+    db.create_all()
+    upgrade_schema()
+    seed_sample_data()
+
+@app.cli.command('init-db')
+def init_db_command():
+    """Create the database schema and sample data: flask --app app init-db"""
+    init_db()
+    print("Database initialized.")
+
+# WSGI accessor and cache warm-up for production servers
+def warm_caches():
+    """
+    Compile every template and run the hot listing queries once so a fresh
+    worker serves its first requests from warm Jinja and SQLAlchemy caches.
+    The queries are the same helpers the API routes call (a LIMIT or other
+    change would produce a different compiled-cache key), so each listing is
+    read once in full; this also warms the database's page cache.
+    Must be called after forking, inside each worker.
+    """
+    for name in app.jinja_env.list_templates():
+        app.jinja_env.get_template(name)
+
+    with app.app_context():
+        course_listing()
+        course_listing('warm-up')
+        event_listing()
+        db.session.remove()
+
+def get_wsgi_app():
+    """
+    Return the module-level application for WSGI servers (see wsgi.py).
+    This is not a factory: app and db are built once at import time, so a
+    second, separately configured instance cannot be created from it.
+    Does not touch the schema; run `flask --app app init-db` once beforehand.
+    """
+    return app
+
+if __name__ == '__main__':
+    with app.app_context():
+        init_db()
     
     app.run(debug=True)
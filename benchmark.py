@@ -0,0 +1,224 @@
+"""
+Benchmarks for the API read paths and the production launcher.
+
+    python benchmark.py reads [N]     # ORM .all() + dict building vs. namedtuple records
+    python benchmark.py startup [N]   # gunicorn startup time and per-worker RSS/PSS (Linux)
+
+Runs against a throw-away SQLite database seeded with N events and
+resources (default 20000) and N / 10 courses. Output can be saved with
+`python benchmark.py reads > bench_output.txt`.
+"""
+import gc
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+import urllib.request
+from datetime import datetime, timedelta
+
+DB_PATH = os.path.join(tempfile.gettempdir(), 'api-benchmark.db')
+REPEATS = 5
+STARTUP_BIND = '127.0.0.1:8799'
+STARTUP_WORKERS = 4
+
+
+def seed(n):
+    from app import app, db, init_db, User, Event, Course, CourseResource
+
+    if os.path.exists(DB_PATH):
+        os.remove(DB_PATH)
+    with app.app_context():
+        init_db()
+        user = User(username='bench', email='bench@example.com', password='x')
+        db.session.add(user)
+        db.session.commit()
+        db.session.execute(db.insert(Event), [dict(
+            title=f'Event {i}', description='d' * 120, event_type='event',
+            date=datetime(2020, 1, 1) + timedelta(hours=i), location='Hall',
+            current_participants=0, status='upcoming', created_at=datetime(2020, 1, 1), user_id=user.id
+        ) for i in range(n)])
+        db.session.execute(db.insert(Course), [dict(
+            course_code=f'BENCH{i}', course_name=f'Course {i}', description='d' * 100,
+            department='Computer Science and Engineering', created_at=datetime(2020, 1, 1)
+        ) for i in range(n // 10)])
+        course_ids = db.session.execute(db.select(Course.id)).scalars().all()
+        db.session.execute(db.insert(CourseResource), [dict(
+            title=f'Resource {i}', description='d' * 50, resource_type='link',
+            course_id=course_ids[i % len(course_ids)], uploaded_at=datetime(2020, 1, 1)
+        ) for i in range(n)])
+        db.session.commit()
+
+
+# Read paths as they were before the record layer: ORM instances copied into dicts
+def orm_events():
+    from app import Event
+
+    events_data = []
+    for event in Event.query.order_by(Event.date.desc()).all():
+        events_data.append({
+            'event_id': event.id,
+            'event_title': event.title,
+            'event_description': event.description,
+            'event_type': event.event_type,
+            'event_date': event.date.isoformat() if event.date else None,
+            'event_location': event.location,
+            'max_participants': event.max_participants,
+            'current_participants': event.current_participants,
+            'event_status': event.status,
+            'created_at': event.created_at.isoformat() if event.created_at else None,
+            'created_by': event.creator.username if event.creator else None,
+            'creator_id': event.user_id
+        })
+    return events_data
+
+
+def orm_courses():
+    from app import Course
+
+    courses_data = []
+    for course in Course.query.order_by(Course.course_code).all():
+        courses_data.append({
+            'course_id': course.id,
+            'course_code': course.course_code,
+            'course_name': course.course_name,
+            'description': course.description,
+            'department': course.department,
+            'resource_count': len(course.resources),
+            'created_at': course.created_at.isoformat() if course.created_at else None
+        })
+    return courses_data
+
+
+def record_events():
+    from app import event_listing, event_api_dict
+
+    return [event_api_dict(event) for event in event_listing()]
+
+
+def record_courses():
+    from app import course_listing, course_api_dict
+
+    courses, resource_counts = course_listing()
+    courses_data = []
+    for course in courses:
+        course_data = course_api_dict(course)
+        course_data['resource_count'] = resource_counts.get(course.id, 0)
+        courses_data.append(course_data)
+    return courses_data
+
+
+def retained_bytes_per_row(load):
+    from app import db
+
+    gc.collect()
+    tracemalloc.start()
+    rows = load()
+    retained = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    db.session.remove()
+    return retained / max(len(rows), 1)
+
+
+def measure(build):
+    """Return (best seconds, peak traced bytes, rows) for one read path, each run in a fresh session."""
+    from app import db
+
+    timings = []
+    for _ in range(REPEATS):
+        db.session.remove()
+        started = time.perf_counter()
+        rows = build()
+        timings.append(time.perf_counter() - started)
+    db.session.remove()
+    gc.collect()
+    tracemalloc.start()
+    build()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    db.session.remove()
+    return min(timings), peak, len(rows)
+
+
+def bench_reads(n):
+    seed(n)
+    from app import app, db, Event, event_listing
+
+    with app.app_context():
+        print(f'Read paths, {n} events / {n // 10} courses / {n} resources, best of {REPEATS}')
+        for name, build in [
+            ('events  ORM .all() + dict', orm_events),
+            ('events  records + dict', record_events),
+            ('courses ORM .all() + dict', orm_courses),
+            ('courses records + dict', record_courses),
+        ]:
+            seconds, peak, rows = measure(build)
+            print(f'{name:28} {rows:7} rows  {seconds * 1000:9.1f} ms  peak {peak / 1e6:7.1f} MB')
+        print('retained bytes per event row (ORM instance):  %.0f'
+              % retained_bytes_per_row(lambda: Event.query.all()))
+        print('retained bytes per event row (EventRecord):   %.0f'
+              % retained_bytes_per_row(lambda: event_listing()))
+
+
+def memory_kb(pid):
+    """Return (RSS, PSS) in kB; PSS splits copy-on-write pages shared with the master."""
+    rss = pss = None
+    with open(f'/proc/{pid}/status') as status:
+        for line in status:
+            if line.startswith('VmRSS:'):
+                rss = int(line.split()[1])
+    try:
+        with open(f'/proc/{pid}/smaps_rollup') as rollup:
+            for line in rollup:
+                if line.startswith('Pss:'):
+                    pss = int(line.split()[1])
+    except OSError:
+        pass
+    return rss, pss
+
+
+def bench_startup(n):
+    seed(n)
+    env = dict(os.environ, WEB_CONCURRENCY=str(STARTUP_WORKERS), BIND=STARTUP_BIND)
+    started = time.monotonic()
+    server = subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py', 'wsgi:app'],
+        cwd=os.path.dirname(os.path.abspath(__file__)), env=env,
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        # The first successful response means a worker has warmed its caches
+        while True:
+            try:
+                urllib.request.urlopen(f'http://{STARTUP_BIND}/api/courses/21201327').read()
+                break
+            except OSError:
+                if server.poll() is not None or time.monotonic() - started > 60:
+                    raise SystemExit('gunicorn did not start')
+                time.sleep(0.05)
+        first_response = time.monotonic() - started
+
+        # Give the remaining workers time to finish warming up
+        time.sleep(2)
+        with open(f'/proc/{server.pid}/task/{server.pid}/children') as children:
+            worker_pids = [int(pid) for pid in children.read().split()]
+
+        print(f'Startup, {STARTUP_WORKERS} workers, {n} events / {n // 10} courses / {n} resources')
+        print(f'time to first response: {first_response:.3f} s')
+        for label, pid in [('master', server.pid)] + [(f'worker {pid}', pid) for pid in worker_pids]:
+            rss, pss = memory_kb(pid)
+            print(f'{label:14} RSS {rss / 1024:7.1f} MB  PSS {pss / 1024 if pss else float("nan"):7.1f} MB')
+    finally:
+        server.terminate()
+        server.wait()
+
+
+if __name__ == '__main__':
+    benches = {'reads': bench_reads, 'startup': bench_startup}
+    if len(sys.argv) < 2 or sys.argv[1] not in benches:
+        print(__doc__)
+        sys.exit(1)
+    os.environ['FLASK_SQLALCHEMY_DATABASE_URI'] = f'sqlite:///{DB_PATH}'
+    count = int(sys.argv[2]) if len(sys.argv) > 2 else 20000
+    benches[sys.argv[1]](count)
@@ -0,0 +1,47 @@
+# Production launcher: gunicorn -c gunicorn.conf.py wsgi:app
+# Initialize the database once beforehand with: flask --app app init-db
+import multiprocessing
+import os
+import resource
+import time
+
+bind = os.environ.get('BIND', '0.0.0.0:8000')
+workers = int(os.environ.get('WEB_CONCURRENCY', multiprocessing.cpu_count() * 2 + 1))
+
+# Import the app once in the master so workers share its memory copy-on-write
+preload_app = True
+
+_master_started = time.monotonic()
+
+
+def _rss_kb():
+    # Current resident set size from /proc, falling back to the peak RSS
+    try:
+        with open('/proc/self/status') as status:
+            for line in status:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def when_ready(server):
+    server.log.info('Master ready: preload took %.3fs, RSS %d kB',
+                    time.monotonic() - _master_started, _rss_kb())
+
+
+def post_fork(server, worker):
+    # Never share pooled database connections across processes
+    from app import app, db
+    with app.app_context():
+        db.engine.dispose()
+
+
+def post_worker_init(worker):
+    from app import warm_caches
+    started = time.monotonic()
+    warm_caches()
+    worker.log.info('Worker %s warm: caches took %.3fs, %.3fs since master start, RSS %d kB',
+                    worker.pid, time.monotonic() - started,
+                    time.monotonic() - _master_started, _rss_kb())
@@ -0,0 +1,4 @@
+from app import get_wsgi_app
+
+# Entry point for production servers, e.g. `gunicorn -c gunicorn.conf.py wsgi:app`
+app = get_wsgi_app()